@@ -1,11 +1,11 @@
-from flask import Blueprint, jsonify, request, current_app
-from datetime import datetime
+import orjson
+from flask import Blueprint, request, current_app, stream_with_context
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 import logging
-import traceback
+import time
 import os
 
-from ..services.extract_service import DataExtractionService
-from ..services.transform_service import DataTransformService
 from ..config.database import db_manager
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -13,11 +13,35 @@ health_bp = Blueprint('health', __name__)
 
 logger = logging.getLogger(__name__)
 
+# Cache the last successful DB probe so load-balancer health polls don't
+# consume a pool slot on every hit
+_HEALTH_TTL = float(os.getenv('HEALTH_PROBE_TTL', '2'))
+_last_health_ok = 0.0
+
+
+def _payload():
+    """Parse the request body once; non-JSON or empty bodies become {}."""
+    return request.get_json(cache=True, silent=True) or {}
+
+
+# Response timestamps only need second resolution, so cache the formatted
+# string per second instead of building a fresh datetime every response.
+# A racing write just re-stores the same second's string, so no lock needed.
+_TS_CACHE = [0, '']
+
+
+def _response_timestamp():
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[1] = datetime.fromtimestamp(t, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        _TS_CACHE[0] = t
+    return _TS_CACHE[1]
+
 
 def create_response(success, data=None, error=None, status_code=200):
     response_data = {
         "success": success,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _response_timestamp(),
     }
 
     if success:
@@ -27,23 +51,39 @@ def create_response(success, data=None, error=None, status_code=200):
         if status_code == 200:
             status_code = 400
 
-    return jsonify(response_data), status_code
+    return current_app.response_class(
+        orjson.dumps(response_data),
+        status=status_code,
+        mimetype='application/json'
+    )
+
+
+def stream_response(generator):
+    """Stream orjson fragments so large payloads never sit fully in memory."""
+    return current_app.response_class(
+        stream_with_context(generator),
+        mimetype='application/json'
+    )
 
 
 @health_bp.route('/health', methods=['GET'])
 def health_check():
+    global _last_health_ok
     try:
-        with db_manager.get_cursor() as cursor:
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
+        if time.monotonic() - _last_health_ok >= _HEALTH_TTL:
+            with db_manager.get_cursor(autocommit=True) as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            _last_health_ok = time.monotonic()
 
+        meta = current_app.config['_STATIC_META']
         return create_response(
             success=True,
             data={
                 "status": "healthy",
                 "database": "connected",
-                "service": current_app.config.get('APP_NAME', 'data-processing-api'),
-                "version": current_app.config.get('APP_VERSION', '1.0.0')
+                "service": meta['app_name'],
+                "version": meta['app_version']
             }
         )
     except Exception as e:
@@ -60,11 +100,11 @@ def extract_data():
     try:
         logger.info("=== Extract Data API Called ===")
 
-        request_data = request.get_json() if request.is_json else {}
-        survey_ids = request_data.get('survey_ids') if request_data else None
-        organisation_id = request_data.get('organisation_id') if request_data else None
+        request_data = _payload()
+        survey_ids = request_data.get('survey_ids')
+        organisation_id = request_data.get('organisation_id')
 
-        extraction_service = DataExtractionService()
+        extraction_service = current_app.extension_services['extract']
 
         if survey_ids:
             result = extraction_service.extract_specific_surveys(survey_ids)
@@ -86,8 +126,7 @@ def extract_data():
             )
 
     except Exception as e:
-        logger.error(f"Extract data API exception: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Extract data API failed")
         return create_response(
             success=False,
             error=f"Internal server error: {str(e)}",
@@ -100,16 +139,22 @@ def extract_definitions():
     try:
         logger.info("=== Extract Definitions API Called ===")
 
-        request_data = request.get_json() if request.is_json else {}
-        survey_ids = request_data.get('survey_ids') if request_data else None
-        organisation_id = request_data.get('organisation_id') if request_data else None
+        request_data = _payload()
+        survey_ids = request_data.get('survey_ids')
+        organisation_id = request_data.get('organisation_id')
 
-        extraction_service = DataExtractionService()
+        extraction_service = current_app.extension_services['extract']
 
         if survey_ids:
             results = {}
-            for survey_id in survey_ids:
-                results[survey_id] = extraction_service.extract_survey_definitions(survey_id)
+            max_workers = min(current_app.config.get('EXTRACT_CONCURRENCY', 8), len(survey_ids))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(extraction_service.extract_survey_definitions, survey_id): survey_id
+                    for survey_id in survey_ids
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
 
             successful = sum(1 for result in results.values() if result["success"])
             extracted = sum(1 for result in results.values() if result.get("action") == "extracted")
@@ -145,8 +190,7 @@ def extract_definitions():
             )
 
     except Exception as e:
-        logger.error(f"Extract definitions API exception: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Extract definitions API failed")
         return create_response(
             success=False,
             error=f"Internal server error: {str(e)}",
@@ -159,12 +203,12 @@ def transform_and_load():
     try:
         logger.info("=== Transform and Load API Called ===")
 
-        request_data = request.get_json() if request.is_json else {}
-        survey_ids = request_data.get('survey_ids') if request_data else None
-        organisation_id = request_data.get('organisation_id') if request_data else None
-        force_mappings_update = request_data.get('force_mappings_update', False) if request_data else False
+        request_data = _payload()
+        survey_ids = request_data.get('survey_ids')
+        organisation_id = request_data.get('organisation_id')
+        force_mappings_update = request_data.get('force_mappings_update', False)
 
-        transform_service = DataTransformService()
+        transform_service = current_app.extension_services['transform']
 
         if survey_ids:
             result = transform_service.transform_specific_surveys(survey_ids, force_mappings_update)
@@ -186,8 +230,7 @@ def transform_and_load():
             )
 
     except Exception as e:
-        logger.error(f"Transform and load API exception: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Transform and load API failed")
         return create_response(
             success=False,
             error=f"Internal server error: {str(e)}",
@@ -200,10 +243,10 @@ def full_pipeline():
     try:
         logger.info("=== Full Pipeline API Called ===")
 
-        request_data = request.get_json() if request.is_json else {}
-        survey_ids = request_data.get('survey_ids') if request_data else None
-        organisation_id = request_data.get('organisation_id') if request_data else None
-        force_mappings_update = request_data.get('force_mappings_update', False) if request_data else False
+        request_data = _payload()
+        survey_ids = request_data.get('survey_ids')
+        organisation_id = request_data.get('organisation_id')
+        force_mappings_update = request_data.get('force_mappings_update', False)
 
         pipeline_result = {
             "extract_phase": None,
@@ -211,14 +254,82 @@ def full_pipeline():
             "overall_success": False
         }
 
-        # Phase 1
-        logger.info("Starting extract phase...")
-        extraction_service = DataExtractionService()
+        extraction_service = current_app.extension_services['extract']
+        transform_service = current_app.extension_services['transform']
 
         if survey_ids:
-            extract_result = extraction_service.extract_specific_surveys(survey_ids)
-        else:
-            extract_result = extraction_service.extract_all_surveys(organisation_id)
+            # Pipeline per survey: start the transform for each survey as soon
+            # as its extraction finishes instead of waiting for all extracts.
+            logger.info(f"Starting pipelined extract+transform for {len(survey_ids)} surveys...")
+
+            extract_details = {}
+            transform_details = {}
+            max_workers = min(current_app.config.get('EXTRACT_CONCURRENCY', 8), len(survey_ids))
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                extract_futures = {
+                    executor.submit(extraction_service.extract_survey_responses, survey_id): survey_id
+                    for survey_id in survey_ids
+                }
+
+                transform_futures = {}
+                for future in as_completed(extract_futures):
+                    survey_id = extract_futures[future]
+                    extract_details[survey_id] = future.result()
+
+                    if extract_details[survey_id].get("success"):
+                        transform_futures[executor.submit(
+                            transform_service.transform_specific_surveys,
+                            [survey_id],
+                            force_mappings_update
+                        )] = survey_id
+                    else:
+                        transform_details[survey_id] = {
+                            "success": False,
+                            "error": "Skipped due to extract failure"
+                        }
+
+                for future in as_completed(transform_futures):
+                    survey_id = transform_futures[future]
+                    transform_result = future.result()
+                    transform_details[survey_id] = transform_result.get("data", {}).get("details", {}).get(
+                        survey_id, transform_result)
+
+            extract_successful = sum(1 for result in extract_details.values() if result.get("success"))
+            transform_successful = sum(
+                1 for result in transform_details.values() if result.get("overall_success"))
+
+            pipeline_result["extract_phase"] = {
+                "success": True,
+                "data": {
+                    "total_surveys": len(survey_ids),
+                    "successful_extractions": extract_successful,
+                    "failed_extractions": len(survey_ids) - extract_successful,
+                    "details": extract_details,
+                    "survey_ids": survey_ids
+                }
+            }
+            pipeline_result["transform_phase"] = {
+                "success": True,
+                "data": {
+                    "total_surveys": len(survey_ids),
+                    "successful_transforms": transform_successful,
+                    "failed_transforms": len(survey_ids) - transform_successful,
+                    "details": transform_details,
+                    "survey_ids": survey_ids
+                }
+            }
+            pipeline_result["overall_success"] = True
+
+            logger.info("Full pipeline completed successfully")
+            return create_response(
+                success=True,
+                data=pipeline_result
+            )
+
+        # Phase 1
+        logger.info("Starting extract phase...")
+        extract_result = extraction_service.extract_all_surveys(organisation_id)
 
         pipeline_result["extract_phase"] = extract_result
 
@@ -232,12 +343,7 @@ def full_pipeline():
 
         # Phase 2
         logger.info("Starting transform and load phase...")
-        transform_service = DataTransformService()
-
-        if survey_ids:
-            transform_result = transform_service.transform_specific_surveys(survey_ids, force_mappings_update)
-        else:
-            transform_result = transform_service.transform_and_load_all(organisation_id, force_mappings_update)
+        transform_result = transform_service.transform_and_load_all(organisation_id, force_mappings_update)
 
         pipeline_result["transform_phase"] = transform_result
 
@@ -257,8 +363,7 @@ def full_pipeline():
             )
 
     except Exception as e:
-        logger.error(f"Full pipeline API exception: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Full pipeline API failed")
         return create_response(
             success=False,
             error=f"Internal server error: {str(e)}",
@@ -269,56 +374,76 @@ def full_pipeline():
 @api_bp.route('/status', methods=['GET'])
 def get_status():
     try:
+        limit = min(int(request.args.get('limit', 5000)), 5000)
+    except (TypeError, ValueError):
+        limit = 5000
+
+    def generate():
         total_surveys = 0
         survey_list = []
 
         try:
             with db_manager.get_cursor() as cursor:
-                cursor.execute("SELECT COUNT(DISTINCT qualtrics_survey_id) as total FROM surveys")
-                total_surveys = cursor.fetchone()['total']
-
+                # Single aggregate query instead of separate COUNT + DISTINCT list;
+                # the id list is capped so huge survey sets don't blow up the payload
                 cursor.execute("""
-                               SELECT DISTINCT qualtrics_survey_id
-                               FROM surveys
-                               ORDER BY qualtrics_survey_id
-                               """)
-                results = cursor.fetchall()
-                survey_list = [row['qualtrics_survey_id'] for row in results]
+                               SELECT (SELECT COUNT(DISTINCT qualtrics_survey_id) FROM surveys) as total,
+                                      (SELECT array_agg(qualtrics_survey_id)
+                                       FROM (SELECT DISTINCT qualtrics_survey_id
+                                             FROM surveys
+                                             ORDER BY qualtrics_survey_id
+                                             LIMIT %s) ids) as ids
+                               """, (limit,))
+                row = cursor.fetchone()
+                total_surveys = row['total']
+                survey_list = row['ids'] or []
 
         except Exception as e:
             logger.warning(f"Failed to fetch surveys info: {e}")
 
-        recent_extractions = []
+        meta = current_app.config['_STATIC_META']
+        head = {
+            "success": True,
+            "timestamp": _response_timestamp(),
+            "data": {
+                "surveys_info": {
+                    "total_surveys": total_surveys,
+                    "survey_ids": survey_list
+                },
+                "data_center": meta['data_center'] or 'not_configured',
+                "data_dir": meta['data_dir'],
+                "app_version": meta['app_version']
+            }
+        }
+
+        # Re-open the data object and stream extraction rows straight off the
+        # cursor instead of materializing them into one big list
+        yield orjson.dumps(head)[:-2] + b',"recent_extractions":['
+
+        first = True
         try:
             with db_manager.get_cursor() as cursor:
+                # Format timestamps in SQL so Python never touches datetime objects
                 cursor.execute("""
-                               SELECT survey_id, extracted_at, file_name, file_size, file_hash
+                               SELECT survey_id,
+                                      to_char(extracted_at, 'YYYY-MM-DD"T"HH24:MI:SS.US') as extracted_at,
+                                      file_name,
+                                      file_size,
+                                      file_hash
                                FROM survey_responses_extraction_log
                                ORDER BY extracted_at DESC LIMIT 10
                                """)
-                recent_extractions = [dict(row) for row in cursor.fetchall()]
-
-                for extraction in recent_extractions:
-                    if extraction['extracted_at']:
-                        extraction['extracted_at'] = extraction['extracted_at'].isoformat()
+                for row in cursor:
+                    yield (b'' if first else b',') + orjson.dumps(dict(row))
+                    first = False
 
         except Exception as e:
             logger.warning(f"Failed to fetch recent extractions: {e}")
 
-        return create_response(
-            success=True,
-            data={
-                "surveys_info": {
-                    "total_surveys": total_surveys,
-                    "survey_ids": survey_list
-                },
-                "recent_extractions": recent_extractions,
-                "data_center": current_app.config.get('QUALTRICS_DATA_CENTER', 'not_configured'),
-                "data_dir": str(current_app.config.get('DATA_DIR', 'not_configured')),
-                "app_version": current_app.config.get('APP_VERSION', '1.0.0')
-            }
-        )
+        yield b']}}'
 
+    try:
+        return stream_response(generate())
     except Exception as e:
         logger.error(f"Status API exception: {e}")
         return create_response(
@@ -32,7 +32,14 @@ class DatabaseManager:
                 'cursor_factory': RealDictCursor,
                 'client_encoding': 'UTF8',
                 'connect_timeout': 30,
-                'application_name': 'qualtrics_data_processor'
+                'application_name': 'qualtrics_data_processor',
+                # Keep idle connections alive through NAT/load balancers so a
+                # silently dropped socket doesn't cost a connect_timeout later
+                'keepalives': 1,
+                'keepalives_idle': 30,
+                'keepalives_interval': 10,
+                'keepalives_count': 3,
+                'tcp_user_timeout': 15000
             }
 
             logger.info("Testing database connection...")
@@ -62,41 +69,51 @@ class DatabaseManager:
         if not self.connection_pool:
             raise Exception("Database connection pool not initialized")
 
-        conn = None
-        try:
+        # No per-borrow validation query: discard connections the pool hands
+        # back already closed, and anything that dies mid-use surfaces as
+        # InterfaceError below and gets closed instead of returned
+        conn = self.connection_pool.getconn()
+        while conn.closed:
+            logger.warning("Discarding closed connection from pool")
+            self.connection_pool.putconn(conn, close=True)
             conn = self.connection_pool.getconn()
-            with conn.cursor() as test_cursor:
-                test_cursor.execute("SELECT 1")
+
+        try:
             yield conn
         except psycopg2.InterfaceError as e:
-            logger.warning(f"Connection lost, attempting to reconnect: {e}")
-            if conn:
-                try:
-                    self.connection_pool.putconn(conn, close=True)
-                except:
-                    pass
-            conn = self.connection_pool.getconn()
-            yield conn
+            logger.warning(f"Connection lost during use, discarding it: {e}")
+            try:
+                self.connection_pool.putconn(conn, close=True)
+            except Exception:
+                pass
+            conn = None
+            raise
         except Exception as e:
-            if conn:
+            try:
                 conn.rollback()
+            except psycopg2.Error:
+                pass
             logger.error(f"Database operation failed: {e}")
             raise
         finally:
-            if conn:
+            if conn is not None:
                 try:
                     self.connection_pool.putconn(conn)
                 except Exception as e:
                     logger.warning(f"Failed to return connection to pool: {e}")
 
     @contextmanager
-    def get_cursor(self, autocommit=False):
+    def get_cursor(self, autocommit=False, name=None, itersize=None):
         with self.get_connection() as conn:
             old_autocommit = conn.autocommit
             if autocommit:
                 conn.autocommit = True
             try:
-                cursor = conn.cursor()
+                # A name makes this a server-side cursor that streams rows
+                # instead of buffering the whole result set client-side
+                cursor = conn.cursor(name=name) if name else conn.cursor()
+                if itersize:
+                    cursor.itersize = itersize
                 yield cursor
                 if not autocommit:
                     conn.commit()
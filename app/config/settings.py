@@ -1,4 +1,5 @@
 import os
+from functools import cached_property
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -9,7 +10,6 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     JSON_AS_ASCII = False
-    JSONIFY_PRETTYPRINT_REGULAR = True
 
     APP_NAME = "Qualtrics Data Processor"
     APP_VERSION = "1.0.0"
@@ -23,8 +23,13 @@ class Config:
     DB_USER = os.getenv("DB_USER")
     DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+    EXTRACT_CONCURRENCY = int(os.getenv("EXTRACT_CONCURRENCY", "8"))
+    # Poll/download all exports on one event loop instead of a thread per survey
+    EXTRACT_USE_ASYNC = os.getenv("EXTRACT_USE_ASYNC", "").lower() in ("1", "true", "yes")
+    TRANSFORM_CONCURRENCY = int(os.getenv("TRANSFORM_CONCURRENCY", "4"))
+
     DB_POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN_CONN", "1"))
-    DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", "10"))
+    DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", str(max(10, 2 * EXTRACT_CONCURRENCY))))
 
     BASE_DIR = Path(__file__).resolve().parent.parent.parent
     DATA_DIR = BASE_DIR / "data"
@@ -38,7 +43,7 @@ class Config:
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-    @property
+    @cached_property
     def database_url(self):
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
@@ -69,22 +74,15 @@ class Config:
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
-        try:
-            port = int(cls.DB_PORT)
-            if not (1 <= port <= 65535):
-                raise ValueError(f"Invalid DB_PORT: {port}. Must be between 1 and 65535")
-        except (ValueError, TypeError):
-            raise ValueError(f"Invalid DB_PORT: {cls.DB_PORT}. Must be a valid integer")
-
-        try:
-            min_conn = int(cls.DB_POOL_MIN_CONN)
-            max_conn = int(cls.DB_POOL_MAX_CONN)
-            if min_conn < 1:
-                raise ValueError(f"DB_POOL_MIN_CONN must be at least 1, got {min_conn}")
-            if max_conn < min_conn:
-                raise ValueError(f"DB_POOL_MAX_CONN ({max_conn}) must be >= DB_POOL_MIN_CONN ({min_conn})")
-        except (ValueError, TypeError) as e:
-            raise ValueError(f"Invalid connection pool configuration: {e}")
+        # Values were already cast to int in the class body; only range-check here
+        if not (1 <= cls.DB_PORT <= 65535):
+            raise ValueError(f"Invalid DB_PORT: {cls.DB_PORT}. Must be between 1 and 65535")
+
+        if cls.DB_POOL_MIN_CONN < 1:
+            raise ValueError(f"DB_POOL_MIN_CONN must be at least 1, got {cls.DB_POOL_MIN_CONN}")
+        if cls.DB_POOL_MAX_CONN < cls.DB_POOL_MIN_CONN:
+            raise ValueError(
+                f"DB_POOL_MAX_CONN ({cls.DB_POOL_MAX_CONN}) must be >= DB_POOL_MIN_CONN ({cls.DB_POOL_MIN_CONN})")
 
         return True
 
@@ -1,13 +1,31 @@
 import logging
 import os
+import signal
 import sys
+import orjson
 from flask import Flask
+from flask.json.provider import JSONProvider
 
 from .config.settings import get_config
 from .config.database import db_manager
+from .services.extract_service import DataExtractionService
+from .services.transform_service import DataTransformService
 from .api.routes import api_bp, health_bp
 
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson's C encoder instead of stdlib json."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def setup_logging(config):
     logging.basicConfig(
         level=getattr(logging, config.LOG_LEVEL),
@@ -20,6 +38,7 @@ def setup_logging(config):
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     try:
         config = get_config()
@@ -50,6 +69,21 @@ def create_app():
             app.logger.error("Please check your database configuration and ensure the database server is running")
             raise
 
+        # Frozen metadata for /health and /status so hot handlers read one
+        # dict instead of doing several config lookups per request
+        app.config['_STATIC_META'] = {
+            'app_name': config.APP_NAME,
+            'app_version': config.APP_VERSION,
+            'data_center': config.QUALTRICS_DATA_CENTER,
+            'data_dir': str(config.DATA_DIR),
+        }
+
+        # Shared service instances so request handlers don't rebuild them
+        app.extension_services = {
+            'extract': DataExtractionService(),
+            'transform': DataTransformService(),
+        }
+
         app.register_blueprint(health_bp)
         app.register_blueprint(api_bp)
 
@@ -74,9 +108,22 @@ def create_app():
             except Exception as e:
                 app.logger.error(f"Error closing database connections: {e}")
 
+        def handle_termination(signum, frame):
+            # atexit only runs once the interpreter unwinds; close the pool
+            # immediately so deploy rollovers don't leak server connections
+            cleanup_resources()
+            os._exit(0)
+
         import atexit
         atexit.register(cleanup_resources)
 
+        try:
+            signal.signal(signal.SIGTERM, handle_termination)
+            signal.signal(signal.SIGINT, handle_termination)
+        except ValueError:
+            # Signal handlers can only be installed from the main thread
+            app.logger.warning("Not in main thread; relying on atexit for cleanup")
+
         return app
 
     except ValueError as e:
@@ -98,12 +145,20 @@ if __name__ == '__main__':
         port = int(os.getenv('PORT', 5000))
         debug = app.config.get('DEBUG', False)
 
-        app.logger.info(f"Starting server on port {port}")
-        app.run(
-            host='0.0.0.0',
-            port=port,
-            debug=debug
-        )
+        if os.getenv('USE_DEV_SERVER'):
+            # Werkzeug's dev server handles one request at a time; only use
+            # it when explicitly asked for
+            app.logger.info(f"Starting development server on port {port}")
+            app.run(
+                host='0.0.0.0',
+                port=port,
+                debug=debug
+            )
+        else:
+            app.logger.info(
+                "Serve with 'gunicorn -c gunicorn.conf.py wsgi:app' in production, "
+                "or set USE_DEV_SERVER=1 for the Werkzeug development server"
+            )
     except KeyboardInterrupt:
         app.logger.info("Shutting down gracefully...")
     except Exception as e:
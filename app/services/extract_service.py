@@ -1,15 +1,19 @@
+import asyncio
+import gzip
+import os
+import tempfile
 import zipfile
-import io
-import pandas as pd
+import httpx
 import logging
+import random
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 
 from .qualtrics_api import QualtricsAPI
 from ..config.database import db_manager
 from ..config.settings import get_config
-from ..utils.file_utils import calculate_file_hash, generate_filename
+from ..utils.file_utils import calculate_file_hash, generate_filename, new_file_hasher
 
 logger = logging.getLogger(__name__)
 
@@ -21,33 +25,16 @@ class DataExtractionService:
 
     def extract_survey_responses(self, survey_id: str):
         """Single Response"""
-        file_name = generate_filename(survey_id)
+        file_name = generate_filename(survey_id, "csv.gz")
         file_path = self.config.DATA_DIR / file_name
 
+        tmp_zip = None
         try:
             logger.info(f"[{survey_id}] Starting survey responses extraction...")
 
-            file_content = self._execute_full_export(survey_id)
+            tmp_zip = self._execute_full_export(survey_id)
 
-            # Save as CSV
-            with zipfile.ZipFile(io.BytesIO(file_content)) as zip_file:
-                csv_filename = zip_file.namelist()[0]
-                with zip_file.open(csv_filename) as f:
-                    df = pd.read_csv(f)
-
-            # Save to data directory
-            df.to_csv(file_path, index=False)
-            logger.info(f"[{survey_id}] Survey responses data saved to {file_path}")
-
-            # Success logging
-            self._log_responses_extraction_result(survey_id, file_name, file_path, success=True)
-
-            return {
-                "success": True,
-                "file_path": str(file_path),
-                "file_name": file_name,
-                "records_count": len(df)
-            }
+            return self._save_responses_file(survey_id, tmp_zip, file_name, file_path)
 
         except Exception as e:
             error_msg = f"Failed to extract survey responses: {str(e)}"
@@ -57,6 +44,48 @@ class DataExtractionService:
                 "success": False,
                 "error": error_msg
             }
+        finally:
+            if tmp_zip is not None:
+                try:
+                    os.unlink(tmp_zip)
+                except OSError:
+                    pass
+
+    def _save_responses_file(self, survey_id, zip_path, file_name, file_path):
+        """Unpack a downloaded export ZIP and persist it to the data directory."""
+        # Copy the CSV member straight to the data directory, gzipped: no need
+        # to parse and re-serialize every cell just to move bytes, and the
+        # compressed file costs far less disk I/O when the transform re-reads
+        # it (pd.read_csv decompresses transparently). The same pass counts
+        # rows from newlines and feeds the hash; size and hash are of the
+        # uncompressed bytes so duplicate detection is stable regardless of
+        # compression level.
+        newline_count = 0
+        file_size = 0
+        hasher = new_file_hasher()
+        with zipfile.ZipFile(zip_path) as zip_file:
+            csv_filename = zip_file.namelist()[0]
+            with zip_file.open(csv_filename) as src, \
+                    gzip.open(file_path, 'wb', compresslevel=3) as dst:
+                while chunk := src.read(1 << 20):
+                    dst.write(chunk)
+                    hasher.update(chunk)
+                    file_size += len(chunk)
+                    newline_count += chunk.count(b'\n')
+
+        records_count = max(newline_count - 1, 0)
+        logger.info(f"[{survey_id}] Survey responses data saved to {file_path}")
+
+        # Success logging
+        self._log_responses_extraction_result(survey_id, file_name, file_path, success=True,
+                                              file_size=file_size, file_hash=hasher.hexdigest())
+
+        return {
+            "success": True,
+            "file_path": str(file_path),
+            "file_name": file_name,
+            "records_count": records_count
+        }
 
     def extract_survey_definitions(self, survey_id: str):
         """Single survey definitions and mappings, only when field_mapping is null """
@@ -106,21 +135,24 @@ class DataExtractionService:
 
     def extract_all_surveys(self, organisation_id=None):
         """Multi surveys' responses"""
-        try:
-            # Get all active survey ids
-            survey_ids = self._get_all_survey_ids_from_db(organisation_id)
+        if self.config.EXTRACT_USE_ASYNC:
+            return self.extract_all_surveys_async(organisation_id)
 
-            if not survey_ids:
-                return {"success": False, "error": "No surveys found in database"}
+        try:
+            logger.info("Starting responses extraction for all active surveys from database")
 
-            results = {}
-            logger.info(
-                f"Starting responses extraction for {len(survey_ids)} surveys from database: {', '.join(survey_ids)}")
+            # Stream ids straight from the cursor: the first exports kick off
+            # before the full id list has been fetched
+            results = self._run_for_surveys(self.extract_survey_responses,
+                                            self._iter_all_survey_ids_from_db(organisation_id))
 
-            for survey_id in survey_ids:
-                results[survey_id] = self.extract_survey_responses(survey_id)
+            if not results:
+                return {"success": False, "error": "No surveys found in database"}
 
-            successful = sum(1 for result in results.values() if result["success"])
+            survey_ids = list(results)
+            successful = 0
+            for result in results.values():
+                successful += bool(result["success"])
             total = len(survey_ids)
 
             logger.info(f"Responses extraction completed: {successful}/{total} successful")
@@ -148,16 +180,34 @@ class DataExtractionService:
             if not survey_ids:
                 return {"success": False, "error": "No surveys found in database"}
 
-            results = {}
-            logger.info(
-                f"Starting definitions extraction for {len(survey_ids)} surveys from database: {', '.join(survey_ids)}")
+            logger.info(f"Starting definitions extraction for {len(survey_ids)} surveys from database")
 
-            for survey_id in survey_ids:
-                results[survey_id] = self.extract_survey_definitions(survey_id)
+            # Settle the "already has mappings" gate for the whole batch in
+            # one round-trip instead of a DB check per survey
+            existing = self._surveys_with_field_mapping(survey_ids)
 
-            successful = sum(1 for result in results.values() if result["success"])
-            extracted = sum(1 for result in results.values() if result.get("action") == "extracted")
-            skipped = sum(1 for result in results.values() if result.get("action") == "skipped")
+            results = {
+                survey_id: {
+                    "success": True,
+                    "action": "skipped",
+                    "reason": "field_mapping_already_exists",
+                    "survey_name": None,
+                    "questions": None,
+                    "questions_count": 0
+                }
+                for survey_id in survey_ids if survey_id in existing
+            }
+
+            missing = [survey_id for survey_id in survey_ids if survey_id not in existing]
+            if missing:
+                results.update(self._run_for_surveys(self.extract_survey_definitions, missing))
+
+            # Tally everything in one pass instead of a scan per counter
+            successful = extracted = skipped = 0
+            for result in results.values():
+                successful += bool(result["success"])
+                extracted += result.get("action") == "extracted"
+                skipped += result.get("action") == "skipped"
             total = len(survey_ids)
 
             logger.info(
@@ -185,13 +235,13 @@ class DataExtractionService:
         if not survey_ids:
             return {"success": False, "error": "No survey IDs provided"}
 
-        results = {}
         logger.info(f"Starting responses extraction for {len(survey_ids)} specified surveys: {', '.join(survey_ids)}")
 
-        for survey_id in survey_ids:
-            results[survey_id] = self.extract_survey_responses(survey_id)
+        results = self._run_for_surveys(self.extract_survey_responses, survey_ids)
 
-        successful = sum(1 for result in results.values() if result["success"])
+        successful = 0
+        for result in results.values():
+            successful += bool(result["success"])
         total = len(survey_ids)
 
         logger.info(f"Specified surveys responses extraction completed: {successful}/{total} successful")
@@ -207,8 +257,143 @@ class DataExtractionService:
             }
         }
 
+    def _run_for_surveys(self, extract_fn, survey_ids):
+        """Run a per-survey extract function concurrently on I/O threads.
+
+        Accepts any iterable of survey ids, so callers can feed it straight
+        from a server-side cursor without materializing the full list first.
+        """
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=self.config.EXTRACT_CONCURRENCY) as executor:
+            futures = {executor.submit(extract_fn, survey_id): survey_id
+                       for survey_id in survey_ids}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
+
+    def extract_all_surveys_async(self, organisation_id=None):
+        """Async sibling of extract_all_surveys: multiplexes every survey's
+        export polling on one event loop instead of a thread per survey."""
+        try:
+            survey_ids = self._get_all_survey_ids_from_db(organisation_id)
+
+            if not survey_ids:
+                return {"success": False, "error": "No surveys found in database"}
+
+            logger.info(
+                f"Starting async responses extraction for {len(survey_ids)} surveys: {', '.join(survey_ids)}")
+
+            results = asyncio.run(self._extract_surveys_gather(survey_ids))
+
+            successful = 0
+            for result in results.values():
+                successful += bool(result["success"])
+            total = len(survey_ids)
+
+            logger.info(f"Responses extraction completed: {successful}/{total} successful")
+
+            return {
+                "success": True,
+                "data": {
+                    "total_surveys": total,
+                    "successful_extractions": successful,
+                    "failed_extractions": total - successful,
+                    "details": results,
+                    "survey_ids": survey_ids
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to extract surveys from database: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def _extract_surveys_gather(self, survey_ids):
+        async with self.api_client.async_client() as client:
+            results = await asyncio.gather(
+                *[self.extract_survey_responses_async(client, survey_id)
+                  for survey_id in survey_ids]
+            )
+        return dict(zip(survey_ids, results))
+
+    async def extract_survey_responses_async(self, client, survey_id: str):
+        file_name = generate_filename(survey_id, "csv.gz")
+        file_path = self.config.DATA_DIR / file_name
+
+        tmp_zip = None
+        try:
+            logger.info(f"[{survey_id}] Starting survey responses extraction...")
+
+            progress_id = await self.api_client.start_export_async(client, survey_id)
+            logger.info(f"[{survey_id}] Export started, progress_id: {progress_id}")
+
+            file_id = await self._wait_for_export_completion_async(client, survey_id, progress_id)
+            logger.info(f"[{survey_id}] Export completed, file_id: {file_id}")
+
+            with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
+                tmp_zip = tmp.name
+                await self._download_export_file_async(client, survey_id, file_id, tmp)
+            logger.info(f"[{survey_id}] File downloaded successfully")
+
+            return self._save_responses_file(survey_id, tmp_zip, file_name, file_path)
+
+        except Exception as e:
+            error_msg = f"Failed to extract survey responses: {str(e)}"
+            logger.error(f"[{survey_id}] {error_msg}")
+
+            return {
+                "success": False,
+                "error": error_msg
+            }
+        finally:
+            if tmp_zip is not None:
+                try:
+                    os.unlink(tmp_zip)
+                except OSError:
+                    pass
+
+    async def _wait_for_export_completion_async(self, client, survey_id: str, progress_id: str):
+        start = time.monotonic()
+        attempt = 0
+        while time.monotonic() - start < self.config.EXPORT_POLL_MAX_SECONDS:
+            result = await self._check_export_status_async(client, survey_id, progress_id)
+
+            if result["status"] == "complete":
+                return result["fileId"]
+            elif result["status"] in {"failed", "error"}:
+                raise Exception(f"Export failed: {result}")
+
+            await asyncio.sleep(self._next_poll_sleep(result, attempt, time.monotonic() - start))
+            attempt += 1
+
+        raise TimeoutError(f"Export timed out after {self.config.EXPORT_POLL_MAX_SECONDS} seconds")
+
+    async def _check_export_status_async(self, client, survey_id: str, progress_id: str):
+        url = f"{self.api_client.base_url}/surveys/{survey_id}/export-responses/{progress_id}"
+
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.json()["result"]
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to check export status for survey {survey_id}: {e}")
+            raise
+
+    async def _download_export_file_async(self, client, survey_id: str, file_id: str, dest_file):
+        url = f"{self.api_client.base_url}/surveys/{survey_id}/export-responses/{file_id}/file"
+
+        try:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(1 << 20):
+                    dest_file.write(chunk)
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to download export file for survey {survey_id}: {e}")
+            raise
+
     def _execute_full_export(self, survey_id: str):
-        """Full export process"""
+        """Full export process; returns the path of a temporary ZIP on disk"""
         try:
             logger.info(f"[{survey_id}] Starting full export process...")
 
@@ -221,20 +406,37 @@ class DataExtractionService:
             file_id = self._wait_for_export_completion(survey_id, progress_id)
             logger.info(f"[{survey_id}] Export completed, file_id: {file_id}")
 
-            # Step 3: Download files
+            # Step 3: Download the file, streaming to disk so the full archive
+            # never sits in memory
             logger.info(f"[{survey_id}] Downloading file...")
-            file_content = self._download_export_file(survey_id, file_id)
+            with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
+                self._download_export_file(survey_id, file_id, tmp)
             logger.info(f"[{survey_id}] File downloaded successfully")
 
-            return file_content
+            return tmp.name
 
         except Exception as e:
             logger.error(f"[{survey_id}] Full export process failed: {e}")
             raise
 
+    def _next_poll_sleep(self, result, attempt, elapsed):
+        """Pick the next poll delay for an in-progress export.
+
+        Starts with fast exponential backoff so small exports are picked up
+        quickly, then switches to an ETA-based delay once percentComplete is
+        reported; both are capped at EXPORT_POLL_INTERVAL.
+        """
+        pct = result.get("percentComplete") or 0
+        if pct > 0 and elapsed > 0:
+            sleep_for = max(0.5, (100 - pct) / pct * elapsed * 0.3)
+        else:
+            sleep_for = 0.5 * 2 ** attempt + random.random() * 0.2
+        return min(sleep_for, self.config.EXPORT_POLL_INTERVAL)
+
     def _wait_for_export_completion(self, survey_id: str, progress_id: str):
-        waited = 0
-        while waited < self.config.EXPORT_POLL_MAX_SECONDS:
+        start = time.monotonic()
+        attempt = 0
+        while time.monotonic() - start < self.config.EXPORT_POLL_MAX_SECONDS:
             try:
                 result = self._check_export_status(survey_id, progress_id)
 
@@ -243,8 +445,8 @@ class DataExtractionService:
                 elif result["status"] in {"failed", "error"}:
                     raise Exception(f"Export failed: {result}")
 
-                time.sleep(self.config.EXPORT_POLL_INTERVAL)
-                waited += self.config.EXPORT_POLL_INTERVAL
+                time.sleep(self._next_poll_sleep(result, attempt, time.monotonic() - start))
+                attempt += 1
 
             except Exception as e:
                 logger.error(f"Error while waiting for export completion: {e}")
@@ -256,21 +458,22 @@ class DataExtractionService:
         url = f"{self.api_client.base_url}/surveys/{survey_id}/export-responses/{progress_id}"
 
         try:
-            response = requests.get(url, headers=self.api_client.headers)
+            response = self.api_client.client.get(url)
             response.raise_for_status()
             return response.json()["result"]
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to check export status for survey {survey_id}: {e}")
             raise
 
-    def _download_export_file(self, survey_id: str, file_id: str):
+    def _download_export_file(self, survey_id: str, file_id: str, dest_file):
         url = f"{self.api_client.base_url}/surveys/{survey_id}/export-responses/{file_id}/file"
 
         try:
-            response = requests.get(url, headers=self.api_client.headers)
-            response.raise_for_status()
-            return response.content
-        except requests.exceptions.RequestException as e:
+            with self.api_client.client.stream("GET", url) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes(1 << 20):
+                    dest_file.write(chunk)
+        except httpx.HTTPError as e:
             logger.error(f"Failed to download export file for survey {survey_id}: {e}")
             raise
 
@@ -288,21 +491,43 @@ class DataExtractionService:
             logger.error(f"Failed to get export progress for {survey_id}: {e}")
             raise
 
-    def _has_existing_field_mapping(self, survey_id):
+    def _surveys_with_field_mapping(self, survey_ids):
+        """Return the subset of survey_ids that already have a field mapping"""
         try:
             with db_manager.get_cursor() as cursor:
                 query = """
-                        SELECT field_mapping
+                        SELECT qualtrics_survey_id
                         FROM surveys
-                        WHERE qualtrics_survey_id = %s
+                        WHERE qualtrics_survey_id = ANY(%s)
                           AND field_mapping IS NOT NULL
                           AND field_mapping != '{}'::jsonb
-                    AND field_mapping != 'null'::jsonb \
+                          AND field_mapping != 'null'::jsonb \
+                        """
+                cursor.execute(query, (list(survey_ids),))
+                return {row['qualtrics_survey_id'] for row in cursor.fetchall()}
+
+        except Exception as e:
+            # Fall back to the per-survey check inside extract_survey_definitions
+            logger.error(f"Failed to bulk-check field mappings: {e}")
+            return set()
+
+    def _has_existing_field_mapping(self, survey_id):
+        try:
+            with db_manager.get_cursor() as cursor:
+                # EXISTS lets Postgres stop at the first match and never ship
+                # the jsonb payload over the wire
+                query = """
+                        SELECT EXISTS(SELECT 1
+                                      FROM surveys
+                                      WHERE qualtrics_survey_id = %s
+                                        AND field_mapping IS NOT NULL
+                                        AND field_mapping != '{}'::jsonb
+                                        AND field_mapping != 'null'::jsonb) \
                         """
                 cursor.execute(query, (survey_id,))
                 result = cursor.fetchone()
 
-                if result:
+                if result and result['exists']:
                     logger.info(f"[{survey_id}] Field mapping already exists")
                     return True
                 else:
@@ -313,10 +538,10 @@ class DataExtractionService:
             logger.error(f"Failed to check field mapping for survey {survey_id}: {e}")
             return False
 
-    def _get_all_survey_ids_from_db(self, organisation_id=None):
-        """Get all survey ids"""
+    def _iter_all_survey_ids_from_db(self, organisation_id=None):
+        """Stream all active survey ids from a server-side cursor"""
         try:
-            with db_manager.get_cursor() as cursor:
+            with db_manager.get_cursor(name='surveys_iter', itersize=500) as cursor:
                 if organisation_id:
                     # Get all active survey ids for specific organisation
                     query = """
@@ -336,14 +561,19 @@ class DataExtractionService:
                             """
                     cursor.execute(query)
 
-                results = cursor.fetchall()
-                return [row['qualtrics_survey_id'] for row in results]
+                for row in cursor:
+                    yield row['qualtrics_survey_id']
 
         except Exception as e:
             logger.error(f"Failed to get survey IDs from database: {e}")
             raise
 
-    def _log_responses_extraction_result(self, survey_id, file_name, file_path, success=True, error_message=None):
+    def _get_all_survey_ids_from_db(self, organisation_id=None):
+        """Get all survey ids as a list (for callers that need the full set upfront)"""
+        return list(self._iter_all_survey_ids_from_db(organisation_id))
+
+    def _log_responses_extraction_result(self, survey_id, file_name, file_path, success=True, error_message=None,
+                                         file_size=None, file_hash=None):
         """Success download process log"""
         if not success:
             logger.info(f"[{survey_id}] Skipping log for failed extraction")
@@ -351,12 +581,14 @@ class DataExtractionService:
 
         try:
             with db_manager.get_cursor() as cursor:
-                if file_path.exists():
+                # Callers that already hashed the bytes while writing them pass
+                # file_size/file_hash in; only re-read the file when they don't
+                if file_size is None or file_hash is None:
+                    if not file_path.exists():
+                        logger.warning(f"[{survey_id}] File does not exist, skipping log")
+                        return None
                     file_size = file_path.stat().st_size
                     file_hash = calculate_file_hash(file_path)
-                else:
-                    logger.warning(f"[{survey_id}] File does not exist, skipping log")
-                    return None
 
                 insert_query = """
                                INSERT INTO survey_responses_extraction_log
@@ -1,11 +1,29 @@
 import json
 import pandas as pd
 import logging
+from itertools import chain
+
+from psycopg2.extras import Json, execute_values
 
 from ..config.database import db_manager
 
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj)
+
 logger = logging.getLogger(__name__)
 
+# qualtrics_survey_id -> surveys.id. The mapping never changes for an existing
+# survey row, so cache it and skip a round-trip per loader call; misses are
+# not cached so newly inserted surveys are picked up immediately.
+_uuid_cache = {}
+_UUID_CACHE_MAX = 1024
+
 
 class DataLoadService:
     def __init__(self):
@@ -15,17 +33,30 @@ class DataLoadService:
         try:
             logger.info(f"Loading mappings for survey {survey_id}")
 
-            # Get UUID of the survey by Qualtrics survey id
-            survey_uuid = self._get_survey_uuid_by_qualtrics_id(survey_id)
-            if not survey_uuid:
+            # Resolve the UUID and the "already has mappings" flag in one
+            # round-trip instead of two separate lookups
+            with db_manager.get_cursor() as cursor:
+                cursor.execute("""
+                               SELECT id,
+                                      (field_mapping IS NOT NULL
+                                          AND field_mapping != '{}'::jsonb) as has_mapping
+                               FROM surveys
+                               WHERE qualtrics_survey_id = %s
+                               """, (survey_id,))
+                row = cursor.fetchone()
+
+            if not row:
                 return {
                     "success": False,
                     "error": f"Survey with qualtrics_survey_id {survey_id} not found in database",
                     "action": "skipped"
                 }
 
-            # Check if any existing mappings then skip the insert
-            if not force_update and self._has_existing_mappings(survey_uuid):
+            survey_uuid = row['id']
+            if len(_uuid_cache) < _UUID_CACHE_MAX:
+                _uuid_cache[survey_id] = survey_uuid
+
+            if not force_update and row['has_mapping']:
                 logger.info(f"Survey {survey_id} already has mappings, skipping update")
                 return {
                     "success": True,
@@ -59,7 +90,13 @@ class DataLoadService:
                 "action": "failed"
             }
 
-    def load_survey_responses(self, survey_id, responses_data, replace_existing=True):
+    def load_survey_responses(self, survey_id, response_batches, replace_existing=True):
+        """Insert responses batch by batch.
+
+        response_batches is an iterable of lists of response dicts, so the
+        transform can stream straight into the loader without the full survey
+        ever being held as one list.
+        """
         try:
             logger.info(f"Loading responses for survey {survey_id}")
 
@@ -71,17 +108,35 @@ class DataLoadService:
                     "error": f"Survey with qualtrics_survey_id {survey_id} not found in database"
                 }
 
+            # Pull the first batch before mutating anything: this forces the
+            # CSV open and first parse, so a corrupt or truncated file fails
+            # here while the survey's existing rows are still intact
+            batch_iter = iter(response_batches)
+            try:
+                batch_iter = chain([next(batch_iter)], batch_iter)
+            except StopIteration:
+                batch_iter = iter(())
+
             deleted_count = 0
             if replace_existing:
                 deleted_count = self._clear_survey_responses(survey_uuid)
 
-            inserted_count = self._insert_survey_responses(survey_uuid, responses_data)
+            inserted_count = 0
+            total_input_records = 0
+            for batch in batch_iter:
+                if not batch:
+                    continue
+                total_input_records += len(batch)
+                inserted_count += self._insert_survey_responses(survey_uuid, batch)
+
+            if total_input_records == 0:
+                logger.warning(f"No response data to insert for survey {survey_id}")
 
             return {
                 "success": True,
                 "deleted_count": deleted_count,
                 "inserted_count": inserted_count,
-                "total_input_records": len(responses_data) if responses_data else 0
+                "total_input_records": total_input_records
             }
 
         except Exception as e:
@@ -103,6 +158,27 @@ class DataLoadService:
             logger.error(f"Failed to check mappings existence for survey {survey_id}: {e}")
             return False
 
+    def get_surveys_with_mappings(self, survey_ids):
+        """Return the subset of qualtrics survey ids that already have mappings.
+
+        One ANY(%s) round-trip for a whole batch; returns None on failure so
+        callers can fall back to per-survey checks.
+        """
+        try:
+            with db_manager.get_cursor() as cursor:
+                cursor.execute("""
+                               SELECT qualtrics_survey_id
+                               FROM surveys
+                               WHERE qualtrics_survey_id = ANY(%s)
+                                 AND field_mapping IS NOT NULL
+                                 AND field_mapping != '{}'::jsonb
+                               """, (list(survey_ids),))
+                return {row['qualtrics_survey_id'] for row in cursor.fetchall()}
+
+        except Exception as e:
+            logger.error(f"Failed to bulk-check survey mappings: {e}")
+            return None
+
     def get_survey_mappings(self, survey_id):
         try:
             survey_uuid = self._get_survey_uuid_by_qualtrics_id(survey_id)
@@ -124,12 +200,19 @@ class DataLoadService:
             return None
 
     def _get_survey_uuid_by_qualtrics_id(self, qualtrics_survey_id):
+        cached = _uuid_cache.get(qualtrics_survey_id)
+        if cached is not None:
+            return cached
+
         try:
             with db_manager.get_cursor() as cursor:
                 query = "SELECT id FROM surveys WHERE qualtrics_survey_id = %s"
                 cursor.execute(query, (qualtrics_survey_id,))
                 result = cursor.fetchone()
                 if result:
+                    if len(_uuid_cache) >= _UUID_CACHE_MAX:
+                        _uuid_cache.clear()
+                    _uuid_cache[qualtrics_survey_id] = result['id']
                     return result['id']
                 else:
                     logger.warning(f"Survey with qualtrics_survey_id {qualtrics_survey_id} not found")
@@ -138,19 +221,27 @@ class DataLoadService:
             logger.error(f"Failed to get survey UUID: {e}")
             raise
 
+    @staticmethod
+    def invalidate_uuid_cache(qualtrics_survey_id=None):
+        """Drop cached UUIDs, e.g. after inserting or deleting survey rows."""
+        if qualtrics_survey_id is None:
+            _uuid_cache.clear()
+        else:
+            _uuid_cache.pop(qualtrics_survey_id, None)
+
     def _has_existing_mappings(self, survey_uuid):
         try:
             with db_manager.get_cursor() as cursor:
                 query = """
-                        SELECT field_mapping
-                        FROM surveys
-                        WHERE id = %s
-                          AND field_mapping IS NOT NULL
-                          AND field_mapping != '{}'::jsonb
+                        SELECT EXISTS(SELECT 1
+                                      FROM surveys
+                                      WHERE id = %s
+                                        AND field_mapping IS NOT NULL
+                                        AND field_mapping != '{}'::jsonb)
                         """
                 cursor.execute(query, (survey_uuid,))
                 result = cursor.fetchone()
-                return result is not None
+                return bool(result and result['exists'])
         except Exception as e:
             logger.error(f"Failed to check existing mappings: {e}")
             raise
@@ -175,7 +266,7 @@ class DataLoadService:
                                """
 
                 cursor.execute(update_query, (
-                    json.dumps(field_mapping_data),
+                    Json(field_mapping_data, dumps=_json_dumps),
                     survey_name,
                     service_type,
                     survey_uuid
@@ -203,56 +294,72 @@ class DataLoadService:
             logger.error(f"Failed to clear survey responses: {e}")
             raise
 
+    def _parse_end_dates(self, responses_data):
+        """Parse every EndDate in one vectorized pass.
+
+        Returns an array of UTC datetimes aligned with the input; unparseable
+        dates come back as NaT.
+        """
+        raw = pd.Series([r.get('EndDate') for r in responses_data], dtype=object)
+        # The timestamp is always the leading "YYYY-MM-DD HH:MM:SS"; slicing
+        # 19 chars drops any ", <suffix>" without scanning for a comma
+        cleaned = raw.astype(str).str.slice(stop=19)
+
+        return pd.to_datetime(cleaned, errors='coerce', utc=True).dt.to_pydatetime()
+
     def _insert_survey_responses(self, survey_uuid, responses_data):
         if not responses_data:
             logger.warning("No response data to insert")
             return 0
 
+        submitted = self._parse_end_dates(responses_data)
+
+        # period_year/period_month are generated columns derived from
+        # submitted_at in Postgres (migrations/001), so only the timestamp
+        # and payload are sent
+        rows = []
+        for response, submitted_at in zip(responses_data, submitted):
+            rows.append((
+                survey_uuid,
+                None if pd.isna(submitted_at) else submitted_at,
+                # Json adapter hands the dict to the driver's C path; the
+                # orjson dumper skips a round through stdlib json
+                Json(response, dumps=_json_dumps)
+            ))
+
+        insert_query = """
+                       INSERT INTO survey_responses
+                           (survey_id, submitted_at, response_data)
+                       VALUES %s
+                       """
+
         try:
             with db_manager.get_cursor() as cursor:
-                insert_query = """
-                               INSERT INTO survey_responses
-                               (survey_id, submitted_at, period_year, period_month,
-                                response_data)
-                               VALUES (%s, %s, %s, %s, %s)
-                               """
-
-                inserted_count = 0
-                for idx, response in enumerate(responses_data):
-                    try:
-                        submitted_at = None
-                        period_year = None
-                        period_month = None
+                # One batched statement per page instead of a round-trip per row
+                execute_values(cursor, insert_query, rows, page_size=1000)
 
-                        if 'EndDate' in response and response['EndDate']:
-                            try:
-                                submitted_at = pd.to_datetime(response['EndDate'])
+            logger.info(f"Successfully inserted {len(rows)} responses using survey UUID {survey_uuid}")
+            return len(rows)
 
-                                from datetime import timedelta
-                                time_str = str(response['EndDate']).strip()
-                                if ',' in time_str:
-                                    time_str = time_str.split(',')[0]
-
-                                utc_dt = pd.to_datetime(time_str).to_pydatetime()
-                                perth_dt = utc_dt + timedelta(hours=8)
-
-                                period_year = perth_dt.year
-                                period_month = perth_dt.month
-
-                                logger.debug(f"Time conversion - UTC: {time_str} -> Perth: {perth_dt.strftime('%Y-%m-%d %H:%M:%S')} -> Period: {period_year}-{period_month:02d}")
+        except Exception as e:
+            logger.warning(f"Bulk insert failed, retrying row by row: {e}")
+            return self._insert_rows_one_by_one(survey_uuid, rows)
 
-                            except Exception as e:
-                                logger.warning(f"Failed to parse EndDate '{response['EndDate']}': {e}")
+    def _insert_rows_one_by_one(self, survey_uuid, rows):
+        """Fallback path that skips individual bad rows when a batch fails."""
+        insert_query = """
+                       INSERT INTO survey_responses
+                           (survey_id, submitted_at, response_data)
+                       VALUES (%s, %s, %s)
+                       """
 
-                        cursor.execute(insert_query, (
-                            survey_uuid,
-                            submitted_at,
-                            period_year,
-                            period_month,
-                            json.dumps(response)
-                        ))
+        try:
+            with db_manager.get_cursor() as cursor:
+                inserted_count = 0
+                for idx, row in enumerate(rows):
+                    try:
+                        cursor.execute(insert_query, row)
                         inserted_count += 1
-
                     except Exception as row_error:
                         logger.warning(f"Failed to insert response {idx}: {row_error}")
                         continue
@@ -1,6 +1,6 @@
-import requests
-import time
+import httpx
 import logging
+
 from ..config.settings import get_config
 
 logger = logging.getLogger(__name__)
@@ -14,33 +14,65 @@ class QualtricsAPI:
         }
         self.base_url = f"https://{self.config.QUALTRICS_DATA_CENTER}.qualtrics.com/API/v3"
 
+        # One pooled HTTP/2 client for every Qualtrics call: concurrent poll
+        # loops multiplex over a single TCP/TLS connection instead of opening
+        # one each. The transport retries connect-level failures; HTTP-status
+        # retries are handled by the adaptive poll loop in the extract service.
+        self.client = httpx.Client(
+            timeout=self.config.API_TIMEOUT,
+            headers=self.headers,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=5,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        )
+
+    def close(self):
+        self.client.close()
+
     def start_export(self, survey_id: str, export_format: str = "csv"):
         url = f"{self.base_url}/surveys/{survey_id}/export-responses/"
 
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                json={"format": export_format},
-                timeout=self.config.API_TIMEOUT
-            )
+            response = self.client.post(url, json={"format": export_format})
             response.raise_for_status()
             return response.json()["result"]["progressId"]
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to start export for survey {survey_id}: {e}")
             raise
 
     def get_survey_responses(self, survey_id: str, export_format: str = "csv"):
         return self.start_export(survey_id, export_format)
 
+    def async_client(self):
+        """HTTP/2 client for multiplexing many export polls on one event loop."""
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=self.config.API_TIMEOUT,
+            headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+
+    async def start_export_async(self, client, survey_id: str, export_format: str = "csv"):
+        url = f"{self.base_url}/surveys/{survey_id}/export-responses/"
+
+        try:
+            response = await client.post(url, json={"format": export_format})
+            response.raise_for_status()
+            return response.json()["result"]["progressId"]
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to start export for survey {survey_id}: {e}")
+            raise
+
     def get_survey_questions(self, survey_id: str):
         url = f"{self.base_url}/survey-definitions/{survey_id}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             response.raise_for_status()
             return response.json()["result"]
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get survey questions for {survey_id}: {e}")
             raise
 
@@ -48,9 +80,9 @@ class QualtricsAPI:
         url = f"{self.base_url}/whoami"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             response.raise_for_status()
             return True
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"API connection test failed: {e}")
-            return False
\ No newline at end of file
+            return False
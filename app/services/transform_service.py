@@ -1,5 +1,8 @@
+import csv
+import gzip
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any
 
 from ..config.settings import get_config
@@ -14,11 +17,20 @@ class DataTransformService:
     def __init__(self):
         self.config = get_config()
         self.load_service = DataLoadService()
+        # frozenset(header) -> selected columns; surveys sharing a Qualtrics
+        # template resolve their column subset once per batch
+        self._cols_cache = {}
 
         self.key_fields = ["Facility", "Satisfaction", "EndDate", "NPS", "NPS_NPS_GROUP", "Gender", "ParticipantType"]
         self.key_fields_prefixes = ["Ab_"]
+        # Precomputed once: set for O(1) membership, tuple so startswith can
+        # test every prefix in one C call
+        self._key_fields_set = set(self.key_fields)
+        self._key_prefixes = tuple(self.key_fields_prefixes)
         self.allowed_keys_dict = ["ServiceType", "Facility", "Satisfaction", "Gender", "ParticipantType"]
         self.allowed_prefixes = ["Ab_"]
+        self._allowed_keys = frozenset(self.allowed_keys_dict)
+        self._allowed_prefix_tuple = tuple(self.allowed_prefixes)
 
     def transform_and_load_all(self, organisation_id=None, force_mappings_update=False):
         try:
@@ -37,30 +49,40 @@ class DataTransformService:
         if not survey_ids:
             return {"success": False, "error": "No survey IDs provided"}
 
-        results = {}
+        # Preallocated so completion order only fills slots, never grows the dict
+        results = {survey_id: None for survey_id in survey_ids}
+        successful = 0
         logger.info(f"Starting transform and load for {len(survey_ids)} surveys: {', '.join(survey_ids)}")
 
-        for survey_id in survey_ids:
-            try:
-                mappings_result = self._process_survey_mappings(survey_id, force_mappings_update)
-
-                responses_result = self._process_survey_responses(survey_id)
-
-                results[survey_id] = {
-                    "mappings": mappings_result,
-                    "responses": responses_result,
-                    "overall_success": mappings_result.get("success", False) and responses_result.get("success", False)
-                }
-
-            except Exception as e:
-                logger.error(f"[{survey_id}] Transform and load failed: {e}")
-                results[survey_id] = {
-                    "mappings": {"success": False, "error": str(e)},
-                    "responses": {"success": False, "error": "Skipped due to mappings failure"},
-                    "overall_success": False
-                }
+        # One round-trip each settles the duplicate-download and
+        # mappings-already-exist checks for the whole batch instead of a
+        # query per survey
+        duplicate_map = self._get_duplicate_map(survey_ids)
+        existing_mappings = None
+        if not force_mappings_update:
+            existing_mappings = self.load_service.get_surveys_with_mappings(survey_ids)
+
+        # Each survey is dominated by API calls, CSV reads and DB inserts, so
+        # run them on I/O threads; every worker leases its own pooled
+        # connection via db_manager.get_cursor()
+        max_workers = min(self.config.TRANSFORM_CONCURRENCY, len(survey_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._run_one, survey_id, force_mappings_update,
+                    # None (bulk check failed) makes transform_survey_responses
+                    # run its own per-survey check
+                    duplicate_map.get(survey_id, {"is_duplicate": False})
+                    if duplicate_map is not None else None,
+                    existing_mappings
+                ): survey_id
+                for survey_id in survey_ids
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                successful += bool(result["overall_success"])
 
-        successful = sum(1 for result in results.values() if result["overall_success"])
         total = len(survey_ids)
 
         logger.info(f"Transform and load completed: {successful}/{total} successful")
@@ -76,6 +98,28 @@ class DataTransformService:
             }
         }
 
+    def _run_one(self, survey_id, force_mappings_update, dup_check, existing_mappings=None):
+        """Transform and load a single survey; per-survey unit for the pool."""
+        try:
+            mappings_result = self._process_survey_mappings(
+                survey_id, force_mappings_update, existing_mappings=existing_mappings)
+
+            responses_result = self._process_survey_responses(survey_id, dup_check=dup_check)
+
+            return {
+                "mappings": mappings_result,
+                "responses": responses_result,
+                "overall_success": mappings_result.get("success", False) and responses_result.get("success", False)
+            }
+
+        except Exception as e:
+            logger.error(f"[{survey_id}] Transform and load failed: {e}")
+            return {
+                "mappings": {"success": False, "error": str(e)},
+                "responses": {"success": False, "error": "Skipped due to mappings failure"},
+                "overall_success": False
+            }
+
     def transform_survey_mappings(self, survey_id: str, survey_name: str, questions: Dict[str, Any]):
         try:
             if not questions or (isinstance(questions, dict) and len(questions) == 0):
@@ -107,9 +151,17 @@ class DataTransformService:
             logger.error(f"[{survey_id}] Failed to transform mappings: {e}")
             return {"success": False, "error": str(e)}
 
-    def transform_survey_responses(self, survey_id: str):
+    def transform_survey_responses(self, survey_id: str, dup_check=None):
+        """Locate the latest CSV and hand back a lazy batch iterator.
+
+        Rows are materialized batch by batch when the caller consumes
+        "batches", so the whole survey never sits in memory as a list of
+        dicts alongside the parsed CSV. Batch callers pass a precomputed
+        dup_check from _get_duplicate_map to skip the per-survey query.
+        """
         try:
-            dup_check = self._is_latest_duplicate_download(survey_id)
+            if dup_check is None:
+                dup_check = self._is_latest_duplicate_download(survey_id)
             if dup_check.get("is_duplicate"):
                 logger.info(f"[{survey_id}] Latest download hash equals previous one; skip transform & load.")
                 return {
@@ -118,24 +170,17 @@ class DataTransformService:
                     "action": "skipped_duplicate",
                     "reason": "latest_two_file_hash_equal",
                     "transformed_count": 0,
-                    "responses_data": [],
-                    "total_records_in_csv": 0,
                     "hash": dup_check.get("latest_hash"),
                 }
 
             logger.info(f"[{survey_id}] Transforming responses")
 
             csv_file = find_latest_csv(self.config.DATA_DIR, survey_id)
-            df_responses = pd.read_csv(csv_file)
-
-            responses_data = self._transform_responses_data(df_responses)
 
             return {
                 "success": True,
                 "survey_id": survey_id,
-                "transformed_count": len(responses_data),
-                "responses_data": responses_data,
-                "total_records_in_csv": len(df_responses)
+                "batches": self._iter_transformed_batches(csv_file)
             }
 
         except FileNotFoundError:
@@ -146,15 +191,84 @@ class DataTransformService:
             logger.error(f"[{survey_id}] Failed to transform responses: {e}")
             return {"success": False, "error": str(e)}
 
-    def _process_survey_mappings(self, survey_id: str, force_update=False):
+    @staticmethod
+    def _read_csv_header(csv_file):
+        opener = gzip.open if str(csv_file).endswith('.gz') else open
+        with opener(csv_file, 'rt', newline='') as f:
+            return next(csv.reader(f))
+
+    def _available_columns(self, columns):
+        key = frozenset(columns)
+        cached = self._cols_cache.get(key)
+        if cached is None:
+            cached = [col for col in columns
+                      if col in self._key_fields_set or col.startswith(self._key_prefixes)]
+            self._cols_cache[key] = cached
+        return cached
+
+    def _iter_transformed_batches(self, csv_file, batch_size=5000):
+        """Yield lists of response dicts, roughly batch_size rows at a time.
+
+        Prefers Arrow's streaming CSV reader with the key columns pushed down
+        into the parser, converting each record batch to dicts in C++; falls
+        back to chunked pandas reads when pyarrow is missing. The two
+        Qualtrics metadata rows are skipped either way.
+        """
         try:
-            if not force_update and self.load_service.check_survey_mappings_exist(survey_id):
-                logger.info(f"[{survey_id}] Mappings already exist, skipping")
-                return {
-                    "success": True,
-                    "action": "skipped",
-                    "reason": "mappings_already_exist"
-                }
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            yield from self._iter_transformed_batches_pandas(csv_file, batch_size)
+            return
+
+        cols = self._available_columns(self._read_csv_header(csv_file))
+        to_skip = 2
+        with pa.input_stream(str(csv_file), compression='detect') as stream:
+            reader = pacsv.open_csv(
+                stream,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+                # Everything stays a string: values end up in a jsonb payload
+                # anyway, and pinning the types skips inference entirely
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=cols,
+                    column_types={c: pa.string() for c in cols}
+                )
+            )
+            for batch in reader:
+                if to_skip:
+                    dropped = min(to_skip, batch.num_rows)
+                    batch = batch.slice(dropped)
+                    to_skip -= dropped
+                if batch.num_rows:
+                    yield batch.to_pylist()
+
+    def _iter_transformed_batches_pandas(self, csv_file, batch_size):
+        cols = self._available_columns(self._read_csv_header(csv_file))
+        for chunk in pd.read_csv(csv_file, usecols=cols, skiprows=[1, 2],
+                                 chunksize=batch_size, engine='c', dtype=str):
+            # Pull each column out once and zip rows back together: the
+            # column-wise pass stays in C, unlike to_dict('records') which
+            # walks the frame row by row through pandas machinery
+            columns = [chunk[c].tolist() for c in cols]
+            yield [dict(zip(cols, row)) for row in zip(*columns)]
+
+    def _process_survey_mappings(self, survey_id: str, force_update=False, existing_mappings=None):
+        try:
+            if not force_update:
+                # Batch callers pass the precomputed set; direct callers (or a
+                # failed bulk check) fall back to the per-survey query
+                if existing_mappings is not None:
+                    has_mappings = survey_id in existing_mappings
+                else:
+                    has_mappings = self.load_service.check_survey_mappings_exist(survey_id)
+
+                if has_mappings:
+                    logger.info(f"[{survey_id}] Mappings already exist, skipping")
+                    return {
+                        "success": True,
+                        "action": "skipped",
+                        "reason": "mappings_already_exist"
+                    }
 
             logger.info(f"[{survey_id}] Need to extract questions for mappings")
 
@@ -193,9 +307,9 @@ class DataTransformService:
             logger.error(f"[{survey_id}] Failed to process mappings: {e}")
             return {"success": False, "error": str(e)}
 
-    def _process_survey_responses(self, survey_id: str):
+    def _process_survey_responses(self, survey_id: str, dup_check=None):
         try:
-            transform_result = self.transform_survey_responses(survey_id)
+            transform_result = self.transform_survey_responses(survey_id, dup_check=dup_check)
 
             if not transform_result.get("success"):
                 return transform_result
@@ -203,20 +317,59 @@ class DataTransformService:
             if transform_result.get("action") == "skipped_duplicate":
                 return transform_result
 
-            responses_data = transform_result.get("responses_data", [])
-            load_result = self.load_service.load_survey_responses(survey_id, responses_data)
+            # Batches flow straight from the CSV reader into the loader, so
+            # peak memory is one batch instead of the whole survey
+            batches = transform_result.pop("batches", [])
+            load_result = self.load_service.load_survey_responses(survey_id, batches)
 
-            combined_result = {
-                **transform_result,
-                **load_result
-            }
+            # Merge in place rather than building a third dict
+            transform_result.update(load_result)
+            transform_result["transformed_count"] = load_result.get("total_input_records", 0)
 
-            return combined_result
+            return transform_result
 
         except Exception as e:
             logger.error(f"[{survey_id}] Failed to process responses: {e}")
             return {"success": False, "error": str(e)}
 
+    def _get_duplicate_map(self, survey_ids):
+        """Duplicate-download check for a batch of surveys in one round-trip.
+
+        Returns {survey_id: {"is_duplicate": bool, "latest_hash": ...}};
+        surveys with no extraction log rows are absent, which callers treat
+        the same as not-duplicate. Returns None on failure so callers fall
+        back to per-survey checks.
+        """
+        try:
+            with db_manager.get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT survey_id,
+                           (array_agg(file_hash ORDER BY extracted_at DESC))[1:2] AS last_hashes
+                    FROM survey_responses_extraction_log
+                    WHERE survey_id = ANY(%s)
+                    GROUP BY survey_id
+                    """,
+                    (list(survey_ids),)
+                )
+                rows = cursor.fetchall() or []
+
+            duplicate_map = {}
+            for row in rows:
+                hashes = row["last_hashes"] or []
+                latest_hash = hashes[0] if hashes else None
+                is_duplicate = (len(hashes) == 2 and latest_hash is not None
+                                and hashes[0] == hashes[1])
+                duplicate_map[row["survey_id"]] = {
+                    "is_duplicate": is_duplicate,
+                    "latest_hash": latest_hash
+                }
+            return duplicate_map
+        except Exception as e:
+            # None tells callers to run the per-survey check instead
+            logger.warning(f"Failed bulk duplicate check, falling back to per-survey checks. Error: {e}")
+            return None
+
     def _is_latest_duplicate_download(self, survey_id: str) -> dict:
         try:
             with db_manager.get_cursor() as cursor:
@@ -229,7 +382,9 @@ class DataTransformService:
                     """,
                     (survey_id,)
                 )
-                rows = cursor.fetchall() or []
+                # LIMIT 2 is already applied; fetchmany avoids fetchall's
+                # extra list handling
+                rows = cursor.fetchmany(2) or []
 
             if len(rows) < 2:
                 return {"is_duplicate": False}
@@ -251,33 +406,39 @@ class DataTransformService:
             "mappings": {}
         }
 
+        # Hoisted locals: this loop runs questions x choices times per survey
+        allowed = self._allowed_keys
+        prefixes = self._allowed_prefix_tuple
+        key_fields = transformed_fields["key_fields"]
+        mappings = transformed_fields["mappings"]
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
         for question in questions.values():
             outer_key = question.get("DataExportTag")
             if not outer_key:
                 continue
 
-            if (outer_key not in self.allowed_keys_dict and
-                    not any(outer_key.startswith(p) for p in self.allowed_prefixes)):
-                continue
-
-            choices = question.get("Choices")
-            if not choices:
-                logger.debug(f"[{outer_key}] No Choices found")
-                continue
-
-            # ServiceType requires special handling
+            # ServiceType is settled up front so the generic mapping path
+            # below never re-tests for it
             if outer_key == "ServiceType":
+                choices = question.get("Choices")
+                if not choices:
+                    if debug_enabled:
+                        logger.debug(f"[{outer_key}] No Choices found")
+                    continue
+
                 service_type_name = ""
 
-                # Get the first choice's display value
-                if "1" in choices:
-                    choice_1 = choices["1"]
-                    if isinstance(choice_1, dict):
-                        service_type_name = choice_1.get("Display", "")
-                    else:
-                        service_type_name = str(choice_1)
+                # Prefer choice "1", else the first available choice
+                choice_1 = choices.get("1")
+                if choice_1 is None:
+                    choice_1 = next(iter(choices.values()), None)
+                if isinstance(choice_1, dict):
+                    service_type_name = choice_1.get("Display", "")
+                elif choice_1 is not None:
+                    service_type_name = str(choice_1)
 
-                # Fallback: get any first available display value
+                # Fallback: first non-empty display value anywhere
                 if not service_type_name:
                     for choice_val in choices.values():
                         if isinstance(choice_val, dict):
@@ -287,56 +448,44 @@ class DataTransformService:
                         if service_type_name:
                             break
 
-                transformed_fields["key_fields"][outer_key] = service_type_name
+                key_fields[outer_key] = service_type_name
                 logger.info(f"[ServiceType] Extracted: '{service_type_name}'")
-                continue  # Skip to next question, don't create mappings for ServiceType
-
-            # For all other fields, create mappings using RecodeValues
-            recode_values = question.get("RecodeValues", {})
-            inner_mapping = {}
+                continue  # Don't create mappings for ServiceType
 
-            for choice_key, choice_value in choices.items():
-                # Get display label
-                if isinstance(choice_value, dict):
-                    display = choice_value.get("Display", "")
-                else:
-                    display = str(choice_value)
+            if outer_key not in allowed and not outer_key.startswith(prefixes):
+                continue
 
-                # Get the recode value for this choice key
-                recode_val = recode_values.get(choice_key)
+            choices = question.get("Choices")
+            if not choices:
+                if debug_enabled:
+                    logger.debug(f"[{outer_key}] No Choices found")
+                continue
 
-                # Use recode value as mapping key if available
-                if recode_val is not None:
-                    mapping_key = str(recode_val)
-                else:
-                    # Fallback to choice_key if no recode value
-                    mapping_key = str(choice_key)
+            # For all other fields, create mappings using RecodeValues;
+            # get(k, k) folds the "no recode value" branch into the lookup and
+            # the inline isinstance keeps mixed dict/plain choice values safe
+            recode_values = question.get("RecodeValues", {})
 
-                inner_mapping[mapping_key] = display
+            inner_mapping = {
+                str(recode_values.get(k, k)):
+                    (v.get("Display", "") if isinstance(v, dict) else str(v))
+                for k, v in choices.items()
+            }
 
             if not inner_mapping:
                 logger.warning(f"[{outer_key}] No mappings created")
                 continue
 
             # Add to regular mappings
-            transformed_fields["mappings"][outer_key] = inner_mapping
+            mappings[outer_key] = inner_mapping
 
         return transformed_fields
 
-    def _transform_responses_data(self, df):
-        prefix_cols = [col for col in df.columns
-                       if any(col.startswith(p) for p in self.key_fields_prefixes)]
-        available_cols = [col for col in (self.key_fields + prefix_cols)
-                          if col in df.columns]
-
-        df_selected = df[available_cols]
-
-        data = df_selected.to_dict(orient='records')[2:]
-        return data
-
     def _get_all_survey_ids_from_db(self, organisation_id=None):
         try:
-            with db_manager.get_cursor() as cursor:
+            # Server-side cursor streams ids instead of buffering the whole
+            # result set client-side
+            with db_manager.get_cursor(name='transform_surveys_iter', itersize=2000) as cursor:
                 if organisation_id:
                     query = """
                             SELECT DISTINCT qualtrics_survey_id
@@ -355,8 +504,7 @@ class DataTransformService:
                             """
                     cursor.execute(query)
 
-                results = cursor.fetchall()
-                return [row['qualtrics_survey_id'] for row in results]
+                return [row['qualtrics_survey_id'] for row in cursor]
 
         except Exception as e:
             logger.error(f"Failed to get survey IDs from database: {e}")
@@ -15,8 +15,12 @@ def parse_date(date_str, format_str=None):
     try:
         if format_str:
             return datetime.strptime(date_str, format_str)
-        else:
-            # 使用pandas的智能日期解析
+
+        # fromisoformat runs in C and covers the common "YYYY-MM-DD HH:MM:SS"
+        # case; fall back to pandas' smart parsing for anything else
+        try:
+            return datetime.fromisoformat(date_str)
+        except (ValueError, TypeError):
             return pd.to_datetime(date_str)
     except (ValueError, TypeError):
         return None
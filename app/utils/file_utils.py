@@ -1,38 +1,86 @@
 import hashlib
-import re
+import os
+import time
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+# sha256 stays the default so hashes remain comparable with the rows already
+# in survey_responses_extraction_log; set FILE_HASH_ALGO=blake3 (with the
+# blake3 package installed) for SIMD multithreaded hashing on large CSVs.
+FILE_HASH_ALGO = os.getenv("FILE_HASH_ALGO", "sha256")
+
+
+def new_file_hasher():
+    """Hasher for extraction-log file hashes; honours FILE_HASH_ALGO."""
+    if FILE_HASH_ALGO == "blake3" and _blake3 is not None:
+        return _blake3(max_threads=_blake3.AUTO)
+    return hashlib.sha256()
+
 
 def calculate_file_hash(file_path):
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        if FILE_HASH_ALGO == "sha256" and hasattr(hashlib, "file_digest"):
+            # Python 3.11+: hashing loop runs in C with a large internal buffer
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        hasher = new_file_hasher()
+        for byte_block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(byte_block)
+        return hasher.hexdigest()
+
+
+# Timestamps are second-resolution, so the formatted string is cached per
+# second; concurrent refreshes are benign (same value either way)
+_TS_CACHE = (0, '')
+
+
+def _current_timestamp():
+    global _TS_CACHE
+    now = int(time.time())
+    if _TS_CACHE[0] != now:
+        _TS_CACHE = (now, datetime.fromtimestamp(now).strftime("%Y%m%d%H%M%S"))
+    return _TS_CACHE[1]
 
 
 def generate_filename(survey_id, file_type="csv"):
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    return f"qualtrics_data_{survey_id}_{timestamp}.{file_type}"
+    return f"qualtrics_data_{survey_id}_{_current_timestamp()}.{file_type}"
 
 
 def find_latest_csv(base_dir, survey_id):
-    base_dir = Path(base_dir)
-    ts_regex = r'_(\d{14})$'
-
-    candidates = []
-    for path in base_dir.glob(f"*{survey_id}*.csv"):
-        matched = re.search(ts_regex, path.stem)
-        if not matched:
-            continue
-        ts_str = matched.group(1)
-        candidates.append((ts_str, path))
-
-    if not candidates:
+    best_path = None
+    best_ts = ''
+
+    # scandir + slice parsing: no glob pattern matching or regex per entry,
+    # which matters once DATA_DIR accumulates thousands of exports. Extracts
+    # write gzipped CSVs; plain .csv files from older runs still match.
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if survey_id not in name:
+                continue
+            if name.endswith('.csv.gz'):
+                stem = name[:-7]
+            elif name.endswith('.csv'):
+                stem = name[:-4]
+            else:
+                continue
+            # Filenames end with "_YYYYMMDDHHMMSS"
+            if len(stem) < 15 or stem[-15] != '_' or not stem[-14:].isdigit():
+                continue
+            ts_str = stem[-14:]
+            if ts_str > best_ts:
+                best_ts = ts_str
+                best_path = entry.path
+
+    if best_path is None:
         raise FileNotFoundError(f"No {survey_id} csv files found in {base_dir}")
 
-    return max(candidates, key=lambda x: x[0])[1]
+    return Path(best_path)
 
 
 def ensure_directory_exists(directory_path):
@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration: gevent workers sized for I/O-bound handlers.
+
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+worker_class = 'gevent'
+worker_connections = 1000
+keepalive = 30
+
+
+def post_fork(server, worker):
+    # psycopg2 blocks the gevent hub unless its wait callback is patched
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+    worker.log.info("Patched psycopg2 for gevent")
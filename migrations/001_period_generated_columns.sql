@@ -0,0 +1,17 @@
+-- Derive period_year/period_month from submitted_at in the database instead
+-- of recomputing them in Python for every insert. Assumes submitted_at is a
+-- timestamptz (the loader inserts UTC-aware timestamps); the generated
+-- columns are always DST-correct for Australia/Perth.
+
+ALTER TABLE survey_responses DROP COLUMN IF EXISTS period_year;
+ALTER TABLE survey_responses DROP COLUMN IF EXISTS period_month;
+
+ALTER TABLE survey_responses
+    ADD COLUMN period_year int GENERATED ALWAYS AS (
+        (EXTRACT(year FROM (submitted_at AT TIME ZONE 'Australia/Perth')))::int
+    ) STORED;
+
+ALTER TABLE survey_responses
+    ADD COLUMN period_month int GENERATED ALWAYS AS (
+        (EXTRACT(month FROM (submitted_at AT TIME ZONE 'Australia/Perth')))::int
+    ) STORED;
@@ -35,19 +35,9 @@ def test_database_connection():
         print("Please check your .env file")
         return False
 
-    print("Testing basic connection...")
-    try:
-        conn = psycopg2.connect(**db_config)
-        print("✅ Basic connection successful")
-        conn.close()
-    except psycopg2.OperationalError as e:
-        print(f"❌ Basic connection failed: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        return False
-
-    print("Testing connection with encoding...")
+    # One connection serves every probe: reaching the server once already
+    # proves connectivity, and reusing it skips two extra TCP handshakes
+    print("Testing connection...")
     try:
         conn = psycopg2.connect(
             **db_config,
@@ -55,8 +45,15 @@ def test_database_connection():
             connect_timeout=30,
             application_name='connection_test'
         )
-        print("✅ Connection with encoding successful")
+        print("✅ Connection successful")
+    except psycopg2.OperationalError as e:
+        print(f"❌ Connection failed: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return False
 
+    try:
         print("Testing query execution...")
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         cursor.execute("SELECT version() as pg_version, current_database() as db_name")
@@ -65,39 +62,28 @@ def test_database_connection():
         print(f"PostgreSQL Version: {result['pg_version']}")
         print(f"Current Database: {result['db_name']}")
 
-        cursor.close()
-        conn.close()
-
-    except Exception as e:
-        print(f"❌ Connection with encoding failed: {e}")
-        return False
-
-    print("Checking required tables...")
-    try:
-        conn = psycopg2.connect(
-            **db_config,
-            client_encoding='UTF8'
-        )
-        cursor = conn.cursor()
-
+        print("Checking required tables...")
         required_tables = ['surveys', 'survey_responses', 'survey_responses_extraction_log']
+
+        # One round-trip for all tables instead of an EXISTS query each
+        cursor.execute("""
+                       SELECT table_name
+                       FROM information_schema.tables
+                       WHERE table_schema = 'public'
+                         AND table_name = ANY(%s)
+                       """, (required_tables,))
+        found = {row['table_name'] for row in cursor.fetchall()}
         for table in required_tables:
-            cursor.execute("""
-                           SELECT EXISTS (SELECT
-                                          FROM information_schema.tables
-                                          WHERE table_schema = 'public'
-                                            AND table_name = %s)
-                           """, (table,))
-            exists = cursor.fetchone()[0]
-            status = "✅" if exists else "❌"
-            print(f"{status} Table '{table}': {'exists' if exists else 'missing'}")
+            status = "✅" if table in found else "❌"
+            print(f"{status} Table '{table}': {'exists' if table in found else 'missing'}")
 
         cursor.close()
-        conn.close()
 
     except Exception as e:
-        print(f"❌ Table check failed: {e}")
+        print(f"❌ Query/table check failed: {e}")
         return False
+    finally:
+        conn.close()
 
     print("\n=== Connection Test Complete ===")
     return True